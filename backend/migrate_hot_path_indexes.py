@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Index Migration Script
+Adds the composite indexes backing the listing and recalculation queries.
+
+This script creates (concurrently, so production traffic is not blocked):
+1. idx_txn_asset_date - transaction history per asset, newest first, covering
+   the columns the list endpoints read so they can use index-only scans
+2. idx_assets_user_created - the per-user asset list ordering
+3. idx_txn_recalc - partial index for the non-dividend recalculation sums
+
+Usage:
+    python migrate_hot_path_indexes.py
+"""
+
+import os
+import sys
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DATABASE_URL = os.environ.get('DATABASE_URL')
+if not DATABASE_URL:
+    print("❌ ERROR: DATABASE_URL environment variable not set")
+    print("Please set DATABASE_URL in your .env file or environment")
+    sys.exit(1)
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so these
+# run on an autocommit connection one at a time
+INDEXES = (
+    (
+        "idx_txn_asset_date",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_txn_asset_date
+        ON transactions (asset_id, transaction_date DESC, created_at DESC)
+        INCLUDE (shares, price_per_share, transaction_type, currency)
+        """,
+    ),
+    (
+        "idx_assets_user_created",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assets_user_created
+        ON assets (user_id, created_at DESC)
+        """,
+    ),
+    (
+        "idx_txn_recalc",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_txn_recalc
+        ON transactions (asset_id)
+        WHERE transaction_type <> 'Dividend'
+        """,
+    ),
+)
+
+
+def run_migration():
+    """Create the hot-path indexes"""
+    print("🚀 Creating hot-path indexes...")
+
+    conn = psycopg2.connect(DATABASE_URL)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            for name, statement in INDEXES:
+                print(f"  Creating {name}...")
+                cursor.execute(statement)
+                print(f"  ✅ {name} ready")
+    finally:
+        conn.close()
+
+    print("✅ Hot-path index migration completed successfully")
+
+
+if __name__ == '__main__':
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        sys.exit(1)
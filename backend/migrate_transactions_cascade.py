@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Transactions Cascade Migration Script
+Recreates the transactions.asset_id foreign key with ON DELETE CASCADE.
+
+With the cascade in place, deleting an asset removes its transaction rows
+in the same statement, so the API no longer issues a separate
+DELETE FROM transactions round trip first. Other child tables (dividends,
+recurring investments) already cascade this way.
+
+Usage:
+    python migrate_transactions_cascade.py
+"""
+
+import os
+import sys
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DATABASE_URL = os.environ.get('DATABASE_URL')
+if not DATABASE_URL:
+    print("❌ ERROR: DATABASE_URL environment variable not set")
+    print("Please set DATABASE_URL in your .env file or environment")
+    sys.exit(1)
+
+
+def run_migration():
+    """Recreate the transactions.asset_id FK with ON DELETE CASCADE"""
+    print("🚀 Recreating transactions.asset_id foreign key with ON DELETE CASCADE...")
+
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cursor:
+            # Drop and re-add in one transaction so there is no window
+            # without referential integrity
+            cursor.execute("""
+                ALTER TABLE transactions
+                DROP CONSTRAINT IF EXISTS transactions_asset_id_fkey
+            """)
+            cursor.execute("""
+                ALTER TABLE transactions
+                ADD CONSTRAINT transactions_asset_id_fkey
+                FOREIGN KEY (asset_id) REFERENCES assets(asset_id) ON DELETE CASCADE
+            """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print("✅ Cascade migration completed successfully")
+
+
+if __name__ == '__main__':
+    try:
+        run_migration()
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        sys.exit(1)